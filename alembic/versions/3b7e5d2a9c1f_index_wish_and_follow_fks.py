@@ -0,0 +1,67 @@
+"""Индексы на FK хотелок и подписчиков
+
+Postgres не создаёт индексы на внешние ключи сам. Списки хотелок фильтруют по
+`wish.user_id` (свои/чужие) и `wish.reserved_by_id` (зарезервированные), а
+список подписчиков — по `user_following.followed_id`, для которого составной
+PK (follower_id, followed_id) не подходит. Без индексов каждый такой запрос —
+полный проход по таблице. `firebase_uid`/`vk_access_token` уже покрыты
+индексами своих UNIQUE-ограничений.
+
+Индексы строятся CONCURRENTLY: обычный CREATE INDEX держит блокировку записи на
+всё время построения, и приложение во время деплоя не смогло бы создавать и
+резервировать хотелки или подписываться.
+
+Revision ID: 3b7e5d2a9c1f
+Revises: a2f7c1d9e4b8
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e5d2a9c1f'
+down_revision: str | None = 'a2f7c1d9e4b8'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+INDEXES = (
+    ('ix_wish_user_id', 'wish', 'user_id'),
+    ('ix_wish_reserved_by_id', 'wish', 'reserved_by_id'),
+    ('ix_user_following_followed_id', 'user_following', 'followed_id'),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY нельзя выполнять внутри транзакции — отсюда autocommit_block.
+    # Прерванный CREATE INDEX CONCURRENTLY оставляет INVALID-индекс, который
+    # IF NOT EXISTS молча пропустил бы. Поэтому перед созданием сносим остаток
+    # прошлой попытки: повторный прогон строит индекс заново.
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
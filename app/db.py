@@ -28,9 +28,11 @@ from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
     mapped_column,
+    raiseload,
     relationship,
     sessionmaker,
 )
+from sqlalchemy.orm.interfaces import LoaderOption
 from sqlalchemy.sql import func
 
 from app.config import settings
@@ -45,7 +47,14 @@ user_following_table = Table(
     'user_following',
     Base.metadata,
     Column('follower_id', ForeignKey('user.id', ondelete='CASCADE'), primary_key=True),
-    Column('followed_id', ForeignKey('user.id', ondelete='CASCADE'), primary_key=True),
+    # Индекс под выборку подписчиков (followed_id = X): составной PK начинается
+    # с follower_id и для неё не годится.
+    Column(
+        'followed_id',
+        ForeignKey('user.id', ondelete='CASCADE'),
+        primary_key=True,
+        index=True,
+    ),
     # Время создания подписки. Nullable: у рёбер, созданных до инструментации,
     # реальная дата неизвестна (NULL = легаси), новые проставляются server_default.
     Column(
@@ -87,7 +96,10 @@ class User(Base):
         String(500),
         unique=True,
     )
-    vk_friends_data: Mapped[list[Any] | None] = mapped_column(JSON)
+    # Снимок VK-друзей — крупный JSON, а читают его только possible_friends и
+    # бёрздей-радар. deferred: не тянем его в каждую выборку юзера (в т.ч.
+    # get_current_user на каждом запросе), подгружается при первом обращении.
+    vk_friends_data: Mapped[list[Any] | None] = mapped_column(JSON, deferred=True)
     firebase_uid: Mapped[str] = mapped_column(String(1000), unique=True)
     firebase_push_token: Mapped[str | None] = mapped_column(String(1000))
     firebase_push_token_saved_at: Mapped[datetime | None] = mapped_column()
@@ -197,9 +209,10 @@ class Wish(Base):
     )
 
     id: Mapped[UUID] = mapped_column(Uuid(), primary_key=True, default=uuid4)
-    user_id: Mapped[UUID] = mapped_column(ForeignKey('user.id'))
+    # Postgres не индексирует FK сам, а списки хотелок фильтруют по обоим.
+    user_id: Mapped[UUID] = mapped_column(ForeignKey('user.id'), index=True)
     reserved_by_id: Mapped[UUID | None] = mapped_column(
-        ForeignKey('user.id'), nullable=True
+        ForeignKey('user.id'), nullable=True, index=True
     )
     name: Mapped[str] = mapped_column(String(250))
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -295,9 +308,26 @@ class FollowEvent(Base):
     )
 
 
+def strict_loading() -> tuple[LoaderOption, ...]:
+    """Опции запроса, запрещающие незапланированную ленивую загрузку связей.
+
+    Только в debug (локально и в тестах): обращение к связи, которую запрос не
+    подгрузил явно (selectinload и т.п.), падает сразу, а не тихо добавляет
+    SELECT на каждую строку — N+1 ловится до прода. В проде — пусто.
+    """
+    return (raiseload('*'),) if settings.IS_DEBUG else ()
+
+
 engine = create_engine(
     settings.DATABASE_URL,
     echo=settings.IS_DEBUG,
+    # Пул под threadpool FastAPI (по умолчанию 40 потоков): 10 постоянных
+    # соединений + до 20 временных на пиках. pre_ping отсеивает соединения,
+    # закрытые сервером, recycle — пересоздаёт их раз в час.
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True,
+    pool_recycle=3600,
     # connect_args={"check_same_thread": False},
 )
 
@@ -1,4 +1,7 @@
-from typing import Annotated
+import hashlib
+import threading
+import time
+from typing import Annotated, Any, TypeVar
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, Query, Request
@@ -7,7 +10,7 @@ from firebase_admin.auth import (
     InvalidIdTokenError,
     verify_id_token,
 )
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 from starlette.status import (
     HTTP_401_UNAUTHORIZED,
@@ -26,6 +29,8 @@ USERS_TAG = 'users'
 PUBLIC_TAG = 'public'
 DEV_TAG = 'dev'
 
+T = TypeVar('T')
+
 
 class PaginationParams:
     """Общие query-параметры пагинации для списочных эндпоинтов."""
@@ -39,6 +44,29 @@ class PaginationParams:
         self.offset = offset
 
 
+class OptionalPaginationParams:
+    """Необязательные limit/offset для списков, исторически отдаваемых целиком.
+
+    Без `limit` отдаётся весь список — старые клиенты не ломаются; с `limit`
+    клиент читает большой список страницами. Форма ответа (массив) не меняется.
+    """
+
+    def __init__(
+        self,
+        limit: Annotated[int | None, Query(ge=1, le=MAX_PAGE_LIMIT)] = None,
+        offset: Annotated[int, Query(ge=0)] = 0,
+    ):
+        self.limit = limit
+        self.offset = offset
+
+    def apply(self, query: Select[tuple[T]]) -> Select[tuple[T]]:
+        if self.limit is not None:
+            query = query.limit(self.limit)
+        if self.offset:
+            query = query.offset(self.offset)
+        return query
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -82,6 +110,39 @@ def _resolve_test_auth_user(token: str, db: Session) -> User:
     return user
 
 
+# Кэш проверенных Firebase ID-токенов: sha256(токен) -> (claims, годен_до).
+# Клиент шлёт один и тот же токен во всех запросах в течение часа его жизни —
+# RSA-проверку подписи незачем повторять на каждом. TTL короткий, чтобы кэш
+# не продлевал жизнь токена заметно дольше, чем его бы проверял Firebase.
+VERIFIED_TOKEN_TTL_SECONDS = 30
+VERIFIED_TOKEN_CACHE_SIZE = 10_000
+_verified_tokens: dict[bytes, tuple[dict[str, Any], float]] = {}
+_verified_tokens_lock = threading.Lock()
+
+
+def _verify_id_token_cached(token: str) -> dict[str, Any]:
+    """verify_id_token с процессным TTL-кэшем по хэшу токена.
+
+    Запись живёт не дольше `exp` самого токена; ошибки проверки не кэшируются.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    now = time.time()
+    with _verified_tokens_lock:
+        cached = _verified_tokens.get(key)
+    if cached and cached[1] > now:
+        return cached[0]
+    decoded_token = verify_id_token(token)
+    expires_at = min(decoded_token.get('exp', 0), now + VERIFIED_TOKEN_TTL_SECONDS)
+    with _verified_tokens_lock:
+        if len(_verified_tokens) >= VERIFIED_TOKEN_CACHE_SIZE:
+            for stale_key in [k for k, v in _verified_tokens.items() if v[1] <= now]:
+                del _verified_tokens[stale_key]
+            if len(_verified_tokens) >= VERIFIED_TOKEN_CACHE_SIZE:
+                _verified_tokens.clear()
+        _verified_tokens[key] = (decoded_token, expires_at)
+    return decoded_token
+
+
 def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
     token = request.headers.get('Authorization')
     if not token:
@@ -95,7 +156,7 @@ def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
         return _resolve_test_auth_user(token, db)
 
     try:
-        decoded_token = verify_id_token(token)
+        decoded_token = _verify_id_token_cached(token)
     except ExpiredIdTokenError:
         raise HTTPException(HTTP_401_UNAUTHORIZED, 'Token expired') from None
     except InvalidIdTokenError:
@@ -114,9 +175,9 @@ def get_current_user_wish(
     user: Annotated[User, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> Wish:
-    wish = db.scalars(select(Wish).where(Wish.id == wish_id)).one_or_none()
+    wish = db.get(Wish, wish_id)
     if not wish:
         raise HTTPException(HTTP_404_NOT_FOUND)
-    if wish.user != user:
+    if wish.user_id != user.id:
         raise HTTPException(HTTP_403_FORBIDDEN)
     return wish
@@ -1,10 +1,12 @@
-from collections.abc import Sequence
+import base64
+import json
+from collections.abc import Callable, Sequence
 from typing import Protocol
 from uuid import UUID
 
 import firebase_admin
 from firebase_admin import auth, messaging
-from firebase_admin.auth import UserRecord
+from firebase_admin.auth import CertificateFetchError, InvalidIdTokenError, UserRecord
 from sqlalchemy import update
 
 from app.config import settings
@@ -124,3 +126,39 @@ def create_custom_firebase_token(uid: str) -> str:
 
 def get_firebase_user_data(uid: str) -> UserRecord:
     return auth.get_user(uid)
+
+
+def _b64_json(data: dict) -> str:
+    raw = json.dumps(data).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def warm_up_id_token_verifier(
+    verify: Callable[[str], object] = auth.verify_id_token,
+) -> None:
+    """Прогревает кэш публичных ключей Firebase до первого запроса.
+
+    verify_id_token скачивает сертификаты Google лениво (и кэширует по
+    Cache-Control), так что без прогрева первый авторизованный запрос воркера
+    платит лишний HTTPS-запрос. Проверяем фиктивный токен: он проходит проверку
+    заголовка и клеймов, доходит до загрузки ключей и падает на подписи.
+    `verify` инжектится ради тестируемости без моков.
+    """
+    project_id = firebase_admin.get_app().project_id
+    header = {'alg': 'RS256', 'kid': 'warm-up', 'typ': 'JWT'}
+    payload = {
+        'aud': project_id,
+        'iss': f'https://securetoken.google.com/{project_id}',
+        'sub': 'warm-up',
+    }
+    token = f'{_b64_json(header)}.{_b64_json(payload)}.'
+    try:
+        verify(token)
+    except InvalidIdTokenError:
+        # Ожидаемо: подпись фиктивная, а ключи уже в кэше.
+        logger.info('Ключи Firebase для verify_id_token загружены')
+    except CertificateFetchError:
+        logger.warning('Не удалось заранее загрузить ключи Firebase')
+    except Exception as exc:
+        # Прогрев best-effort и идёт в фоновом потоке: не роняем его трейсбеком.
+        logger.warning('Прогрев verify_id_token не удался: {exc}', exc=exc)
@@ -1,5 +1,7 @@
+from functools import cache
 from typing import Any
 
+from pydantic import TypeAdapter
 from sqlalchemy import Select, func, select
 from sqlalchemy.orm import Session
 
@@ -7,6 +9,12 @@ from app.dependencies import PaginationParams
 from app.schemas import ItemT, PageSchema
 
 
+@cache
+def _items_adapter(item_schema: type[ItemT]) -> TypeAdapter[list[ItemT]]:
+    # Валидатор списка строится один раз на схему и проверяет страницу целиком.
+    return TypeAdapter(list[item_schema])  # ty: ignore[invalid-type-form]
+
+
 def paginate(
     db: Session,
     query: Select[tuple[Any]],
@@ -16,7 +24,7 @@ def paginate(
     """Выполнить offset/limit-пагинацию запроса и собрать страницу-ответ."""
     total = db.scalar(select(func.count()).select_from(query.subquery())) or 0
     rows = db.scalars(query.limit(params.limit).offset(params.offset)).all()
-    items = [item_schema.model_validate(row) for row in rows]
+    items = _items_adapter(item_schema).validate_python(rows)
     return PageSchema(
         items=items,
         total=total,
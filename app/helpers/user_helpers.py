@@ -2,10 +2,12 @@ import os
 import re
 from collections.abc import Sequence
 from datetime import datetime
+from functools import cache
 
 import httpx
+from pydantic import TypeAdapter
 from sqlalchemy import Select, select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 
 from app.config import settings
 from app.db import User
@@ -19,6 +21,18 @@ PROFILE_IMAGES_DIR = settings.MEDIA_ROOT / 'profile_images'
 AVATAR_DOWNLOAD_TIMEOUT_SECONDS = 15
 # Целевой размер стороны для Google-аватарок (см. upscale_google_avatar_url).
 TARGET_AVATAR_SIZE = 512
+# Колонки User, которые читает AnnotatedOtherUserSchema. Остальные (токены,
+# телефон, служебные метки) для чужих профилей не нужны — не тянем их из БД.
+ANNOTATED_USER_COLUMNS = (
+    User.id,
+    User.display_name,
+    User.photo_url,
+    User.gender,
+    User.birth_date,
+)
+# Валидатор списка строится один раз: весь список проверяется одним вызовом
+# pydantic-core, а не model_validate на каждый элемент.
+ANNOTATED_USERS_ADAPTER = TypeAdapter(list[AnnotatedOtherUserSchema])
 
 
 def guess_image_extension(content: bytes) -> str:
@@ -75,15 +89,23 @@ def upscale_google_avatar_url(url: str) -> str:
     return f'{url}=s{TARGET_AVATAR_SIZE}-c'
 
 
+@cache
+def get_avatar_client() -> httpx.Client:
+    """Общий клиент на процесс (как get_vk_client): аватарки при логине качаются
+    с одних и тех же CDN (VK, Google), keep-alive избавляет от TLS-рукопожатия на
+    каждый вход. Создаётся лениво — прокси из окружения не влияет на импорт.
+    """
+    return httpx.Client(timeout=AVATAR_DOWNLOAD_TIMEOUT_SECONDS)
+
+
 def download_avatar_bytes(url: str, client: httpx.Client | None = None) -> bytes | None:
     """Скачать аватарку (Google — в высоком разрешении). None при ошибке.
 
     Ошибку скачивания логируем и глушим (возвращаем None): вызывающий решает,
     что делать (обнулить битую ссылку / оставить текущее фото).
     """
-    own_client = client is None
     if client is None:
-        client = httpx.Client(timeout=AVATAR_DOWNLOAD_TIMEOUT_SECONDS)
+        client = get_avatar_client()
     try:
         response = client.get(upscale_google_avatar_url(url), follow_redirects=True)
         response.raise_for_status()
@@ -91,9 +113,6 @@ def download_avatar_bytes(url: str, client: httpx.Client | None = None) -> bytes
     except httpx.HTTPError as exc:
         logger.warning('Не удалось скачать аватарку url={url}: {exc}', url=url, exc=exc)
         return None
-    finally:
-        if own_client:
-            client.close()
 
 
 def refresh_avatar_on_login(
@@ -128,9 +147,11 @@ def get_annotated_users(
         User,
         User.followed_by.any(User.id == current_user.id).label('followed_by_me'),
         User.follows.any(User.id == current_user.id).label('follows_me'),
-    )
+    ).options(load_only(*ANNOTATED_USER_COLUMNS))
     if isinstance(outer_users, Select):
-        user_ids = [user.id for user in db.execute(outer_users).scalars()]
+        # Внешний запрос — подзапросом по id: без отдельного round-trip и без
+        # гидрации полных строк User только ради их id.
+        user_ids = outer_users.with_only_columns(User.id).correlate(None)
         query = query.where(User.id.in_(user_ids))
     elif outer_users is not None:
         user_ids = [user.id for user in outer_users]
@@ -139,7 +160,7 @@ def get_annotated_users(
     for user, followed_by_me, follows_me in values:
         user.followed_by_me = followed_by_me
         user.follows_me = follows_me
-    return [AnnotatedOtherUserSchema.model_validate(val[0]) for val in values]
+    return ANNOTATED_USERS_ADAPTER.validate_python([val[0] for val in values])
 
 
 def get_user_deep_link(user: User, ref: User | None = None) -> str:
@@ -1,9 +1,12 @@
 import enum
+import threading
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Annotated
 
 from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from hawk_python_sdk import Hawk
@@ -16,6 +19,7 @@ from app.db import engine
 
 # Реэкспорт для обратной совместимости
 from app.dependencies import get_current_user, get_db
+from app.firebase import warm_up_id_token_verifier
 from app.helpers import get_user_deep_link
 from app.logging import logger
 from app.routers import (
@@ -43,9 +47,24 @@ settings.LOGS_DIR.mkdir(exist_ok=True, parents=True)
 # SDK допускает None в рантайме (no-op), но в их сигнатуре тип занижен.
 hawk = Hawk(settings.HAWK_TOKEN)  # ty: ignore[invalid-argument-type]
 
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    # Ключи Firebase грузим в фоне: старт воркера не ждёт сети Google,
+    # а первый авторизованный запрос уже не платит за их загрузку.
+    threading.Thread(target=warm_up_id_token_verifier, daemon=True).start()
+    # Схему OpenAPI собираем заранее, чтобы её не ждал первый запрос /docs.
+    application.openapi()
+    yield
+
+
+OPENAPI_URL = '/openapi.json'
+
 app = FastAPI(
     title='Хотелки',
     root_path=settings.URL_ROOT_PATH,
+    openapi_url=OPENAPI_URL,
+    lifespan=lifespan,
 )
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
 
@@ -126,9 +145,11 @@ async def health():
 
 
 @app.get('/health/ready')
-async def health_ready(db: Annotated[Session, Depends(get_db)]):
+def health_ready(db: Annotated[Session, Depends(get_db)]):
     # Readiness для внешнего мониторинга (uptime-бот): сервис реально способен
     # обслуживать запросы, т.е. БД доступна. Отдаёт 503, если нет.
+    # Синхронный def: запросы к БД блокирующие, их место в threadpool — в event
+    # loop зависшая БД на время таймаута остановила бы все остальные запросы.
     try:
         # SET LOCAL — таймаут в рамках текущей транзакции, чтобы при зависшей (не
         # мёртвой) БД эндпоинт быстро отдал 503, а не держал соединение бота.
@@ -177,5 +198,31 @@ def custom_openapi():
 default_openapi = app.openapi
 app.openapi = custom_openapi  # ty: ignore[invalid-assignment]
 
+# Сериализованная схема по root_path запроса (в проде он один).
+_openapi_json_cache: dict[str, bytes] = {}
+
+
+async def openapi_json(request: Request) -> Response:
+    # Замена встроенного /openapi.json: тот на каждый запрос заново прогоняет
+    # закэшированную схему через json.dumps. Схема после старта неизменна —
+    # кодируем её в байты один раз. servers с root_path — как у FastAPI.
+    root_path = request.scope.get('root_path', '').rstrip('/')
+    content = _openapi_json_cache.get(root_path)
+    if content is None:
+        schema = app.openapi()
+        servers = schema.get('servers', [])
+        server_urls = {server.get('url') for server in servers}
+        if root_path and app.root_path_in_servers and root_path not in server_urls:
+            schema = {**schema, 'servers': [{'url': root_path}, *servers]}
+        content = bytes(JSONResponse(schema).body)
+        _openapi_json_cache[root_path] = content
+    return Response(content, media_type='application/json')
+
+
+app.router.routes = [
+    route for route in app.routes if getattr(route, 'path', None) != OPENAPI_URL
+]
+app.add_route(OPENAPI_URL, openapi_json, include_in_schema=False)
+
 # Включаем HEAD для всех GET-роутов после регистрации всех эндпоинтов
 enable_head_for_get_routes(app)
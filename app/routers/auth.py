@@ -1,17 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import Response
 from firebase_admin.auth import verify_id_token
 from firebase_admin.exceptions import AlreadyExistsError, FirebaseError
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import InstrumentedAttribute, Session
 
 from app.db import User
 from app.dependencies import AUTH_TAG, get_current_user, get_db
 from app.firebase import (
     create_custom_firebase_token,
     create_firebase_user,
+    delete_firebase_user,
     get_firebase_user_data,
 )
 from app.helpers import refresh_avatar_on_login
@@ -64,6 +67,28 @@ _VK_CODE_AUTH_RESPONSES: dict[int | str, dict[str, Any]] = {
 }
 
 
+def _insert_user_or_get_existing(
+    db: Session, key: InstrumentedAttribute[Any], **values: Any
+) -> tuple[User, bool]:
+    """Создать юзера одним `INSERT ... ON CONFLICT (key) DO NOTHING RETURNING`.
+
+    Первый вход одного человека с двух устройств параллельно раньше ронял второй
+    запрос на уникальном индексе (оба не нашли юзера SELECT-ом и оба вставляли).
+    Теперь вставляет один, второй получает уже созданную строку.
+    Возвращает `(user, created)`: `created=False` — юзера создал параллельный вход.
+    """
+    user = db.scalar(
+        insert(User)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=[key])
+        .returning(User)
+    )
+    if user is not None:
+        return user, True
+    existing = db.scalars(select(User).where(key == values[key.key])).one()
+    return existing, False
+
+
 def auth_vk_via_code(
     request_data: RequestVkAuthVkidSchema,
     db: Session,
@@ -98,7 +123,11 @@ def auth_vk(
     attribution: RegistrationAttributionSchema | None = None,
     email_verified: bool = False,
 ) -> tuple[str, str, bool]:
-    vk_basic_data = get_vk_user_data_by_access_token(access_token)
+    # friends.get не зависит от users.get — запрашиваем параллельно, чтобы вход
+    # ждал один сетевой round-trip к VK, а не два подряд.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        vk_friends_future = executor.submit(get_vk_user_friends, access_token)
+        vk_basic_data = get_vk_user_data_by_access_token(access_token)
 
     user = db.scalars(
         select(User).where(User.vk_id == str(vk_basic_data.id))
@@ -129,8 +158,10 @@ def auth_vk(
                     'Зайдите через соответствующий аккаунт.'
                 ),
             ) from None
-        user = User(
-            vk_id=vk_basic_data.id,
+        user, is_new_user = _insert_user_or_get_existing(
+            db,
+            User.vk_id,
+            vk_id=str(vk_basic_data.id),
             vk_access_token=access_token,
             display_name=f'{vk_basic_data.first_name} {vk_basic_data.last_name}',
             phone=vk_extra_data.phone,
@@ -140,6 +171,11 @@ def auth_vk(
             gender=vk_basic_data.gender,
             registered_at=utc_now(),
         )
+        if not is_new_user:
+            # Параллельный вход успел создать юзера — созданный нами
+            # firebase-аккаунт лишний, входим в уже существующий.
+            delete_firebase_user(firebase_uid)
+            firebase_uid = user.firebase_uid
     else:
         firebase_uid = user.firebase_uid
 
@@ -150,7 +186,7 @@ def auth_vk(
     # possible_friends). Best-effort: сбой VK-запроса не должен ронять логин —
     # оставляем прежний снимок.
     try:
-        user.vk_friends_data = get_vk_user_friends(access_token)
+        user.vk_friends_data = vk_friends_future.result()
     except Exception as exc:
         logger.warning('Не удалось обновить список VK-друзей: {exc}', exc=exc)
     user.last_login_at = utc_now()
@@ -270,7 +306,9 @@ def auth_firebase(
 
     is_new_user = not bool(user)
     if is_new_user:
-        user = User(
+        user, is_new_user = _insert_user_or_get_existing(
+            db,
+            User.firebase_uid,
             display_name=firebase_user.display_name,
             phone=firebase_user.phone_number,
             email=firebase_user.email,
@@ -304,7 +342,14 @@ def save_push_token(
 
     Вызывается после аутентификации через vk или firebase.
     """
-    user.firebase_push_token = schema.push_token
-    user.firebase_push_token_saved_at = utc_now()
-    db.add(user)
+    # Вызывается на каждом запуске приложения — пишем колонки одним UPDATE по id,
+    # минуя unit-of-work для уже загруженного юзера.
+    db.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(
+            firebase_push_token=schema.push_token,
+            firebase_push_token_saved_at=utc_now(),
+        )
+    )
     db.commit()
@@ -1,3 +1,4 @@
+from functools import cache
 from pathlib import Path
 from uuid import UUID
 
@@ -7,16 +8,37 @@ from fastapi.templating import Jinja2Templates
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.db import User, Wish
 from app.dependencies import get_db
 from app.helpers.og_helpers import build_og_context
 
 TEMPLATES_DIR = Path(__file__).parent.parent / 'templates'
-templates = Jinja2Templates(directory=TEMPLATES_DIR)
+
+
+def build_templates(is_debug: bool) -> Jinja2Templates:
+    """Шаблоны OG-превью.
+
+    Скомпилированный шаблон Jinja держит в памяти, но с auto_reload на каждый
+    рендер делает stat() файла, проверяя, не изменился ли он. В проде шаблоны
+    меняются только с деплоем (перезапуском процесса) — проверка не нужна.
+    """
+    templates = Jinja2Templates(directory=TEMPLATES_DIR)
+    templates.env.auto_reload = is_debug
+    return templates
+
+
+templates = build_templates(settings.IS_DEBUG)
 
 router = APIRouter()
 
 
+@cache
+def _render_brand_fallback() -> str:
+    """HTML бренд-превью. Контекст не зависит от запроса — рендерим один раз."""
+    return templates.get_template('og_user.html').render(build_og_context(None, 0))
+
+
 def _parse_user_id(raw: str | None) -> UUID | None:
     """userId из deep link. Кривой/пустой → None: краулеру отдаём бренд-фолбэк,
     а не 422 (иначе ссылка в чате выглядит мёртвой)."""
@@ -41,14 +63,14 @@ def og_user(
     сюда запросы `/user` с UA краулера; живые юзеры идут в SPA (см. deploy/nginx).
     """
     user: User | None = None
-    wish_count = 0
     user_id = _parse_user_id(userId)
     if user_id is not None:
-        user = db.scalars(select(User).where(User.id == user_id)).one_or_none()
-    if user is not None:
-        active_wishes = Wish.get_active_wish_query().where(Wish.user_id == user.id)
-        wish_count = (
-            db.scalar(select(func.count()).select_from(active_wishes.subquery())) or 0
-        )
+        user = db.get(User, user_id)
+    if user is None:
+        return HTMLResponse(_render_brand_fallback())
+    active_wishes = Wish.get_active_wish_query().where(Wish.user_id == user.id)
+    wish_count = (
+        db.scalar(select(func.count()).select_from(active_wishes.subquery())) or 0
+    )
     context = build_og_context(user, wish_count)
     return templates.TemplateResponse(request, 'og_user.html', context)
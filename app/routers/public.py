@@ -2,7 +2,6 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import HttpUrl
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 from starlette.status import HTTP_404_NOT_FOUND
 
@@ -85,7 +84,7 @@ def public_wishlist(
     **Состояния:** `200` со списком; `200` с пустым `wishes` (нет желаний); `404`
     (нет такого пользователя). В фазе 1 все списки публичны — приватного режима нет.
     """
-    user = db.scalars(select(User).where(User.id == user_id)).one_or_none()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(HTTP_404_NOT_FOUND, 'Пользователь не найден')
     wishes = db.scalars(Wish.get_active_wish_query().where(Wish.user == user)).all()
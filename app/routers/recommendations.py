@@ -36,9 +36,7 @@ def list_recommendations(
 def get_recommendation(rec_id: UUID, db: Session = Depends(get_db)):
     from app.db import Wish
 
-    rec = db.scalars(
-        select(WishRecommendation).where(WishRecommendation.id == rec_id)
-    ).one_or_none()
+    rec = db.get(WishRecommendation, rec_id)
     if not rec:
         raise HTTPException(HTTP_404_NOT_FOUND, 'Recommendation not found')
     rec.wishes_count = db.scalar(  # ty: ignore[invalid-assignment]
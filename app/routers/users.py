@@ -8,13 +8,14 @@ from fastapi import (
     UploadFile,
 )
 from httpx import HTTPError
-from sqlalchemy import select
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from starlette.status import HTTP_404_NOT_FOUND
 
 from app.config import settings
 from app.constants import FollowAction
-from app.db import FollowEvent, User
+from app.db import FollowEvent, User, user_following_table
 from app.dependencies import USERS_TAG, get_current_user, get_db
 from app.firebase import delete_firebase_user
 from app.helpers import (
@@ -61,7 +62,6 @@ def update_profile(
     user.birth_date = update_data.birth_date
     user.display_name = update_data.display_name
     user.gender = update_data.gender
-    db.add(user)
     db.commit()
 
 
@@ -73,7 +73,6 @@ def set_profile_image(
 ):
     content = image.file.read()
     save_profile_image_bytes(user, content, is_custom=True)
-    db.add(user)
     db.commit()
 
 
@@ -117,7 +116,7 @@ def get_user(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    user = db.scalars(select(User).where(User.id == user_id)).one_or_none()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(HTTP_404_NOT_FOUND, 'User not found')
     return get_annotated_users(db, current_user, [user])[0]
@@ -140,7 +139,7 @@ def user_followers(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    user = db.scalars(select(User).where(User.id == user_id)).one()
+    user = db.get_one(User, user_id)
     return get_annotated_users(db, current_user, user.followed_by)
 
 
@@ -150,7 +149,7 @@ def users_followed_by_this_user(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    user = db.scalars(select(User).where(User.id == user_id)).one()
+    user = db.get_one(User, user_id)
     return get_annotated_users(db, current_user, user.follows)
 
 
@@ -191,10 +190,17 @@ def follow_user(
     таргета предполагается (валидный id из приложения); несуществующий — `5xx`
     (вне контракта). Побочно ставит пуш подписанному о новом подписчике.
     """
-    follow_user = db.execute(select(User).where(User.id == follow_user_id)).scalar_one()
-    if follow_user in user.follows:
+    follow_user = db.get_one(User, follow_user_id)
+    # Ребро вставляем напрямую, а не через user.follows.append: тот сначала
+    # загружает всю коллекцию подписок. ON CONFLICT — идемпотентность повтора.
+    created = db.scalar(
+        insert(user_following_table)
+        .values(follower_id=user.id, followed_id=follow_user.id)
+        .on_conflict_do_nothing()
+        .returning(user_following_table.c.follower_id)
+    )
+    if created is None:
         return
-    user.follows.append(follow_user)
     # Логируем факт подписки с источником (инструментация графа). Пишем только
     # при реальном создании ребра — повторный follow сюда не доходит.
     db.add(
@@ -245,17 +251,22 @@ def unfollow_user(
     при пустом теле пишется `source = null`. Отписки логируются наравне с подписками —
     таблица рёбер их теряет. Событие и удаление ребра — в одной транзакции.
     """
-    unfollow_user = db.execute(
-        select(User).where(User.id == unfollow_user_id)
-    ).scalar_one()
-    if unfollow_user not in user.follows:
+    # Ребро удаляем одним DELETE по ключу, не загружая коллекцию подписок.
+    deleted = db.scalar(
+        delete(user_following_table)
+        .where(
+            user_following_table.c.follower_id == user.id,
+            user_following_table.c.followed_id == unfollow_user_id,
+        )
+        .returning(user_following_table.c.follower_id)
+    )
+    if deleted is None:
         return
-    user.follows.remove(unfollow_user)
     # Отписку тоже логируем — сигнал оттока связей, которого таблица рёбер не хранит.
     db.add(
         FollowEvent(
             actor_id=user.id,
-            target_id=unfollow_user.id,
+            target_id=unfollow_user_id,
             action=FollowAction.unfollow,
             source=body.source if body else None,
         )
@@ -336,10 +347,12 @@ async def get_item_info_from_page(
         }
     },
 )
-def get_invite_link(user: User = Depends(get_current_user)) -> str:
+async def get_invite_link(user: User = Depends(get_current_user)) -> str:
     """Вернуть персональную инвайт-ссылку текущего юзера для шеринга своего списка.
 
     Ссылка содержит реф-метку `ref={my_id}` — основу реферальной атрибуции
     (см. фичу 0003). Форма ссылки и контракт получателя — в описании ответа 200.
     """
+    # async: тело не делает блокирующего I/O (юзер уже загружен зависимостью),
+    # поэтому исполняем прямо в event loop, без прыжка в threadpool.
     return get_user_deep_link(user, ref=user)
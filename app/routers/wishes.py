@@ -1,17 +1,24 @@
 from decimal import Decimal
 from hashlib import md5
 from pathlib import Path
+from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile
 from fastapi.responses import Response
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, exists, or_, select, update
+from sqlalchemy.orm import Session, selectinload
 from starlette.status import HTTP_403_FORBIDDEN, HTTP_404_NOT_FOUND
 
 from app.config import settings
-from app.db import User, Wish, WishRecommendation
-from app.dependencies import WISHES_TAG, get_current_user, get_current_user_wish, get_db
+from app.db import User, Wish, WishRecommendation, strict_loading
+from app.dependencies import (
+    WISHES_TAG,
+    OptionalPaginationParams,
+    get_current_user,
+    get_current_user_wish,
+    get_db,
+)
 from app.schemas import WishReadSchema, WishWriteSchema
 
 router = APIRouter(tags=[WISHES_TAG])
@@ -29,11 +36,7 @@ def add_wish(
 ):
     recommendation_id = None
     if wish_data.recommendation_id:
-        rec = db.scalars(
-            select(WishRecommendation).where(
-                WishRecommendation.id == wish_data.recommendation_id
-            )
-        ).one_or_none()
+        rec = db.get(WishRecommendation, wish_data.recommendation_id)
         if not rec:
             raise HTTPException(HTTP_404_NOT_FOUND, 'Recommendation not found')
         recommendation_id = rec.id
@@ -52,17 +55,33 @@ def add_wish(
 
 
 @router.get('/wishes', response_model=list[WishReadSchema])
-def my_wishes(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    query = Wish.get_active_wish_query().where(Wish.user == user)
-    return db.scalars(query)
+def my_wishes(
+    pagination: Annotated[OptionalPaginationParams, Depends()],
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    # WishReadSchema отдаёт владельца (`user`) — грузим его одним IN-запросом,
+    # а не ленивым SELECT на каждую хотелку.
+    query = (
+        Wish.get_active_wish_query()
+        .where(Wish.user_id == user.id)
+        .order_by(Wish.created_at, Wish.id)
+        .options(selectinload(Wish.user), *strict_loading())
+    )
+    return db.scalars(pagination.apply(query)).all()
 
 
 @router.get('/reserved_wishes', response_model=list[WishReadSchema])
 def my_reserved_wishes(
     user: User = Depends(get_current_user), db: Session = Depends(get_db)
 ):
-    query = Wish.get_active_wish_query().where(Wish.reserved_by == user)
-    return db.scalars(query)
+    # Владельцы зарезервированных хотелок разные — без selectinload это N+1.
+    query = (
+        Wish.get_active_wish_query()
+        .where(Wish.reserved_by_id == user.id)
+        .options(selectinload(Wish.user), *strict_loading())
+    )
+    return db.scalars(query).all()
 
 
 @router.get('/wishes/{wish_id}', response_model=WishReadSchema)
@@ -71,8 +90,8 @@ def get_wish(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    wish = db.scalars(select(Wish).where(Wish.id == wish_id)).one_or_none()
-    if not wish or (wish.is_archived and wish.user != user):
+    wish = db.get(Wish, wish_id)
+    if not wish or (wish.is_archived and wish.user_id != user.id):
         raise HTTPException(HTTP_404_NOT_FOUND, 'Wish not found')
     return wish
 
@@ -87,17 +106,28 @@ def update_wish(
     wish.description = wish_data.description
     wish.price = Decimal(wish_data.price) if wish_data.price else None
     wish.link = str(wish_data.link) if wish_data.link else None
-    db.add(wish)
     db.commit()
 
 
 @router.delete('/wishes/{wish_id}')
 def delete_wish(
+    wish_id: UUID,
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-    wish: Wish = Depends(get_current_user_wish),
 ):
-    db.delete(wish)
-    db.commit()
+    # Проверка владельца и удаление — одним DELETE, без загрузки хотелки.
+    deleted_id = db.scalar(
+        delete(Wish)
+        .where(Wish.id == wish_id, Wish.user_id == current_user.id)
+        .returning(Wish.id)
+    )
+    if deleted_id:
+        db.commit()
+        return
+    wish_exists = db.scalar(select(exists().where(Wish.id == wish_id)))
+    if not wish_exists:
+        raise HTTPException(HTTP_404_NOT_FOUND)
+    raise HTTPException(HTTP_403_FORBIDDEN)
 
 
 @router.post('/wishes/{wish_id}/image')
@@ -113,7 +143,6 @@ def upload_wish_image(
     file_path = WISH_IMAGES_DIR / file_name
     file_path.write_bytes(content)
     wish.image = file_name
-    db.add(wish)
     db.commit()
 
 
@@ -123,17 +152,25 @@ def delete_wish_image(
     db: Session = Depends(get_db),
 ):
     wish.image = None
-    db.add(wish)
     db.commit()
 
 
 @router.get('/users/{user_id}/wishes', response_model=list[WishReadSchema])
-def user_wishes(user_id: UUID, db: Session = Depends(get_db)):
-    user = db.scalars(select(User).where(User.id == user_id)).one_or_none()
+def user_wishes(
+    user_id: UUID,
+    pagination: Annotated[OptionalPaginationParams, Depends()],
+    db: Session = Depends(get_db),
+):
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(404, 'Пользователь не найден')
-    query = Wish.get_active_wish_query().where(Wish.user == user)
-    return db.scalars(query)
+    query = (
+        Wish.get_active_wish_query()
+        .where(Wish.user_id == user.id)
+        .order_by(Wish.created_at, Wish.id)
+        .options(selectinload(Wish.user), *strict_loading())
+    )
+    return db.scalars(pagination.apply(query)).all()
 
 
 @router.post('/wishes/{wish_id}/reserve', response_class=Response)
@@ -142,17 +179,31 @@ def reserve_wish(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    # Проверка «не своя и не занята другим» и запись — одним условным UPDATE:
+    # без предварительного SELECT, и два одновременных резерва не перетрут друг
+    # друга.
+    updated_id = db.scalar(
+        update(Wish)
+        .where(
+            Wish.id == wish_id,
+            ~Wish.is_archived,
+            Wish.user_id != current_user.id,
+            or_(Wish.reserved_by_id.is_(None), Wish.reserved_by_id == current_user.id),
+        )
+        .values(reserved_by_id=current_user.id)
+        .returning(Wish.id)
+    )
+    if updated_id:
+        db.commit()
+        return
+    # Хотелка не обновилась — дочитываем её только чтобы выбрать код ошибки.
     query = Wish.get_active_wish_query().where(Wish.id == wish_id)
     wish = db.scalars(query).one_or_none()
     if not wish:
         raise HTTPException(HTTP_404_NOT_FOUND, 'Wish not found')
-    if wish.user == current_user:
+    if wish.user_id == current_user.id:
         raise HTTPException(HTTP_403_FORBIDDEN, 'Cannot reserve own wish')
-    if wish.reserved_by and wish.reserved_by != current_user:
-        raise HTTPException(HTTP_403_FORBIDDEN, 'Reserved by someone else')
-    wish.reserved_by = current_user
-    db.add(wish)
-    db.commit()
+    raise HTTPException(HTTP_403_FORBIDDEN, 'Reserved by someone else')
 
 
 @router.post('/wishes/{wish_id}/cancel_reservation', response_class=Response)
@@ -161,14 +212,22 @@ def cancel_wish_reservation(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    wish = db.execute(select(Wish).where(Wish.id == wish_id)).scalar_one_or_none()
-    if not wish:
+    updated_id = db.scalar(
+        update(Wish)
+        .where(
+            Wish.id == wish_id,
+            or_(Wish.reserved_by_id.is_(None), Wish.reserved_by_id == current_user.id),
+        )
+        .values(reserved_by_id=None)
+        .returning(Wish.id)
+    )
+    if updated_id:
+        db.commit()
+        return
+    wish_exists = db.scalar(select(exists().where(Wish.id == wish_id)))
+    if not wish_exists:
         raise HTTPException(404, 'Wish not found')
-    if wish.reserved_by and wish.reserved_by != current_user:
-        raise HTTPException(HTTP_403_FORBIDDEN, 'Reserved by someone else')
-    wish.reserved_by = None
-    db.add(wish)
-    db.commit()
+    raise HTTPException(HTTP_403_FORBIDDEN, 'Reserved by someone else')
 
 
 @router.post('/wishes/{wish_id}/archive', response_class=Response)
@@ -176,7 +235,6 @@ def archive_wish(
     db: Session = Depends(get_db), wish: Wish = Depends(get_current_user_wish)
 ):
     wish.is_archived = True
-    db.add(wish)
     db.commit()
 
 
@@ -185,7 +243,6 @@ def unarchive_wish(
     db: Session = Depends(get_db), wish: Wish = Depends(get_current_user_wish)
 ):
     wish.is_archived = False
-    db.add(wish)
     db.commit()
 
 
@@ -193,4 +250,8 @@ def unarchive_wish(
 def archived_wishes(
     db: Session = Depends(get_db), user: User = Depends(get_current_user)
 ):
-    return db.scalars(select(Wish).where(Wish.user == user, Wish.is_archived))
+    return db.scalars(
+        select(Wish)
+        .where(Wish.user_id == user.id, Wish.is_archived)
+        .options(selectinload(Wish.user), *strict_loading())
+    ).all()
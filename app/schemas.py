@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Generic, TypeVar
+from typing import Annotated, Generic, TypeVar
 from uuid import UUID
 
 from pydantic import (
@@ -8,6 +8,7 @@ from pydantic import (
     EmailStr,
     Field,
     HttpUrl,
+    WithJsonSchema,
     field_validator,
 )
 
@@ -15,6 +16,11 @@ from app.constants import BirthdayRadarKind, FollowSource, Gender, TestPersona
 
 ItemT = TypeVar('ItemT', bound=BaseModel)
 
+# Email в ответе: значение из БД уже провалидировано при записи, а проверка
+# EmailStr (email-validator) стоит ~70 мкс на каждый ответ. Отдаём как строку,
+# контракт в OpenAPI — тот же `format: email`.
+EmailOut = Annotated[str, WithJsonSchema({'type': 'string', 'format': 'email'})]
+
 
 class PageSchema(BaseModel, Generic[ItemT]):
     """Универсальная схема-страница для offset/limit-пагинации."""
@@ -424,7 +430,7 @@ class AnnotatedOtherUserSchema(BaseUserSchema):
 
 class CurrentUserReadSchema(BaseUserSchema):
     phone: str | None
-    email: EmailStr | None
+    email: EmailOut | None
     follows: list[OtherUserSchema]
     followed_by: list[OtherUserSchema]
 
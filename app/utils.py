@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import exists, select
 from sqlalchemy.orm import Session
 
 from app.constants import UTM_SOURCE_MAX_LENGTH
@@ -40,8 +40,8 @@ def _resolve_referrer_id(
     if referrer_id == user.id:
         # self-referral игнорируем
         return None
-    exists = db.scalars(select(User.id).where(User.id == referrer_id)).one_or_none()
-    return referrer_id if exists is not None else None
+    referrer_exists = db.scalar(select(exists().where(User.id == referrer_id)))
+    return referrer_id if referrer_exists else None
 
 
 def save_registration_attribution(
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from datetime import date, datetime
+from functools import cache
 from typing import NoReturn
 
 import httpx
@@ -16,6 +17,30 @@ VK_API_VERSION = '5.191'
 # {'error', 'error_description'}. Токен, полученный тут серверным обменом,
 # привязан к IP бэка (в отличие от Public Flow, где он привязан к IP телефона).
 VK_ID_OAUTH_URL = 'https://id.vk.ru/oauth2/auth'
+# Методы легаси VK API. httpx.URL разбираем один раз при импорте, а не строку
+# на каждом запросе.
+VK_USERS_GET_URL = httpx.URL('https://api.vk.com/method/users.get')
+VK_FRIENDS_GET_URL = httpx.URL('https://api.vk.com/method/friends.get')
+VK_SILENT_PROFILE_URL = httpx.URL(
+    'https://api.vk.com/method/auth.getProfileInfoBySilentToken'
+)
+# Таймаут одного запроса к VK, секунды (как у одноразовых httpx.get/post).
+VK_REQUEST_TIMEOUT_SECONDS = 5
+
+
+@cache
+def get_vk_client() -> httpx.Client:
+    """Общий клиент на процесс: keep-alive пул переиспользует TCP+TLS-соединения
+    к api.vk.com/id.vk.ru между вызовами (одноразовые httpx.get/post открывали
+    новое соединение на каждый запрос логина).
+
+    Создаётся лениво, при первом запросе к VK, а не при импорте: конструктор
+    читает прокси из окружения, и кривой прокси не должен ронять импорт модуля.
+    """
+    return httpx.Client(
+        timeout=VK_REQUEST_TIMEOUT_SECONDS,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    )
 
 
 class VkResponseError(Exception):
@@ -130,8 +155,8 @@ def get_extra_user_data_by_silent_token(
     Пока не используется: заготовка под мобильный VK ID SDK флоу, где email
     приходит подтверждённым от VK, а не из тела запроса клиента.
     """
-    response = httpx.post(
-        'https://api.vk.com/method/auth.getProfileInfoBySilentToken',
+    response = get_vk_client().post(
+        VK_SILENT_PROFILE_URL,
         params={
             'v': VK_API_VERSION,
             'access_token': settings.VK_SERVICE_KEY,
@@ -171,8 +196,8 @@ class _VkUsersGetResponseSchema(BaseModel):
 
 
 def get_vk_user_data_by_access_token(access_token: str) -> VkUserBasicData:
-    response = httpx.get(
-        'https://api.vk.com/method/users.get',
+    response = get_vk_client().get(
+        VK_USERS_GET_URL,
         params={
             'v': VK_API_VERSION,
             'access_token': access_token,
@@ -217,8 +242,8 @@ class _VkFriendsGetResponseSchema(BaseModel):
 
 
 def get_vk_user_friends(access_token: str):
-    response = httpx.get(
-        'https://api.vk.com/method/friends.get',
+    response = get_vk_client().get(
+        VK_FRIENDS_GET_URL,
         params={
             'v': VK_API_VERSION,
             'access_token': access_token,
@@ -287,7 +312,7 @@ def exchange_vk_code(
     Email/phone возвращает сам VK (подтверждённый источник) — их НЕ берём из тела
     запроса клиента (иначе возможен захват чужого аккаунта подстановкой email).
     """
-    response = httpx.post(
+    response = get_vk_client().post(
         VK_ID_OAUTH_URL,
         data={
             'grant_type': 'authorization_code',
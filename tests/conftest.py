@@ -1,7 +1,7 @@
 import httpx
 import pytest
 from alembic.config import Config
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
 
 from alembic import command
@@ -141,6 +141,24 @@ def db(test_engine, mocker):
     connection.close()
 
 
+@pytest.fixture
+def select_statements(test_engine):
+    """Список SELECT-ов, ушедших в тестовую БД за время теста.
+
+    Для регрессий N+1: тест очищает список перед действием и проверяет, сколько
+    запросов оно сделало. SAVEPOINT/INSERT фикстур не считаются.
+    """
+    statements: list[str] = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append(statement)
+
+    event.listen(test_engine, 'before_cursor_execute', _before_cursor_execute)
+    yield statements
+    event.remove(test_engine, 'before_cursor_execute', _before_cursor_execute)
+
+
 @pytest.fixture(autouse=True)
 def _disable_avatar_refresh_on_login(mocker):
     # refresh-на-логине ходит во внешнюю сеть за аватаркой; в auth-тестах глушим,
@@ -152,6 +170,19 @@ def _disable_avatar_refresh_on_login(mocker):
         pass
 
 
+@pytest.fixture(autouse=True)
+def _clear_verified_token_cache(mocker):
+    # Тесты мокают verify_id_token разными ответами на один и тот же токен —
+    # процессный кэш проверенных токенов не должен протекать между ними.
+    mocker.patch.dict('app.dependencies._verified_tokens', clear=True)
+
+
+@pytest.fixture
+def mock_vk_client(mocker):
+    """Подменяет общий VK-клиент моком; тест настраивает его .get/.post."""
+    return mocker.patch('app.vk.get_vk_client').return_value
+
+
 @pytest.fixture
 def anyio_backend():
     return 'asyncio'
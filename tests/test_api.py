@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, datetime, timezone
 from pathlib import Path
 from uuid import UUID, uuid4
 
@@ -146,6 +146,38 @@ class TestMyWishes:
         assert response.is_success
         assert [w['id'] for w in response.json()] == [str(wish.id)]
 
+    @pytest.fixture
+    def three_wishes(self, db: Session, user: User) -> list[Wish]:
+        wishes = [
+            Wish(
+                user_id=user.id,
+                name=f'wish {day}',
+                created_at=datetime(2024, 1, day, tzinfo=timezone.utc),
+            )
+            for day in (3, 1, 2)
+        ]
+        db.add_all(wishes)
+        db.commit()
+        return sorted(wishes, key=lambda wish: wish.created_at)
+
+    @pytest.mark.parametrize('url', ['/wishes', '/users/{user_id}/wishes'])
+    def test_wishes_ordered_by_creation(
+        self, auth_client: TestClient, user: User, three_wishes: list[Wish], url: str
+    ):
+        response = auth_client.get(url.format(user_id=user.id))
+        assert response.is_success
+        assert [w['id'] for w in response.json()] == [str(w.id) for w in three_wishes]
+
+    @pytest.mark.parametrize('url', ['/wishes', '/users/{user_id}/wishes'])
+    def test_wishes_limit_offset(
+        self, auth_client: TestClient, user: User, three_wishes: list[Wish], url: str
+    ):
+        response = auth_client.get(
+            url.format(user_id=user.id), params={'limit': 1, 'offset': 1}
+        )
+        assert response.is_success
+        assert [w['id'] for w in response.json()] == [str(three_wishes[1].id)]
+
 
 class TestPublicWishlist:
     """Публичный веб-вишлист: открывается без авторизации, без PII владельца."""
@@ -302,6 +334,13 @@ class TestOgPreview:
         assert 'content="https://hotelki.pro/static/og_banner.png"' in response.text
         assert 'content="Список желаний"' in response.text
 
+    def test_template_auto_reload_only_in_debug(self):
+        from app.routers.og import build_templates
+
+        # В проде повторный рендер не перепроверяет шаблон на диске.
+        assert build_templates(is_debug=True).env.auto_reload is True
+        assert build_templates(is_debug=False).env.auto_reload is False
+
     def test_unknown_user_id_renders_brand_fallback(self, api_client: TestClient):
         response = api_client.get(f'/og/user?userId={uuid4()}')
         assert response.is_success
@@ -309,6 +348,16 @@ class TestOgPreview:
         assert 'content="Список желаний по ссылке — узнай, что подарить"' in html
         assert 'content="https://hotelki.pro/static/og_banner.png"' in html
 
+    def test_brand_fallback_rendered_once(self, api_client: TestClient, mocker):
+        from app.routers.og import _render_brand_fallback, templates
+
+        _render_brand_fallback.cache_clear()
+        get_template = mocker.spy(templates, 'get_template')
+        first = api_client.get('/og/user')
+        second = api_client.get(f'/og/user?userId={uuid4()}')
+        assert first.text == second.text
+        get_template.assert_called_once_with('og_user.html')
+
     def test_invalid_user_id_renders_brand_fallback(self, api_client: TestClient):
         response = api_client.get('/og/user?userId=not-a-uuid')
         assert response.is_success
@@ -336,6 +385,68 @@ class TestReservedWishes:
         assert response.is_success
         assert [w['id'] for w in response.json()] == [str(reserved_wish.id)]
 
+    def test_list_reserved_wishes_of_different_owners(
+        self, auth_client: TestClient, db: Session, user: User, other_user, third_user
+    ):
+        # Владельцы подгружаются пачкой (selectinload) — у каждой хотелки свой.
+        for owner in (other_user, third_user):
+            db.add(Wish(user_id=owner.id, reserved_by_id=user.id, name='gift'))
+        db.commit()
+        response = auth_client.get('/reserved_wishes')
+        assert response.is_success
+        owner_ids = {w['user']['id'] for w in response.json()}
+        assert owner_ids == {str(other_user.id), str(third_user.id)}
+
+    def test_list_reserved_wishes_query_count(
+        self,
+        auth_client: TestClient,
+        db: Session,
+        user: User,
+        other_user,
+        third_user,
+        select_statements,
+    ):
+        # Хотелки + один IN-запрос за владельцами, независимо от числа строк.
+        for owner in (other_user, third_user, other_user):
+            db.add(Wish(user_id=owner.id, reserved_by_id=user.id, name='gift'))
+        db.commit()
+        # Текущий юзер в проде приходит свежим из get_current_user.
+        db.refresh(user)
+        select_statements.clear()
+        response = auth_client.get('/reserved_wishes')
+        assert response.is_success
+        assert len(response.json()) == 3
+        assert len(select_statements) <= 2
+
+    def test_reserved_wishes_query_count_independent_of_owners(
+        self,
+        auth_client: TestClient,
+        db: Session,
+        user: User,
+        select_statements,
+    ):
+        def count_selects(owners_count: int) -> int:
+            # У каждой хотелки свой владелец — ленивая загрузка wish.user дала бы
+            # по SELECT на строку.
+            for i in range(owners_count):
+                owner = User(
+                    display_name=f'Owner {owners_count}-{i}',
+                    firebase_uid=f'owner uid {owners_count}-{i}',
+                    registered_at=utc_now(),
+                )
+                db.add(owner)
+                db.flush()
+                db.add(Wish(user_id=owner.id, reserved_by_id=user.id, name='gift'))
+            db.commit()
+            db.expire_all()
+            db.refresh(user)
+            select_statements.clear()
+            response = auth_client.get('/reserved_wishes')
+            assert response.is_success
+            return len(select_statements)
+
+        assert count_selects(1) == count_selects(4)
+
     def test_reserve_wish(
         self,
         auth_client: TestClient,
@@ -348,6 +459,22 @@ class TestReservedWishes:
         db.refresh(other_user_wish)
         assert other_user_wish.reserved_by_id == user.id
 
+    def test_reserve_wish_query_count(
+        self,
+        auth_client: TestClient,
+        other_user_wish: Wish,
+        db: Session,
+        user: User,
+        select_statements,
+    ):
+        # Резерв — один условный UPDATE, без предварительных SELECT-ов.
+        db.refresh(user)
+        wish_id = other_user_wish.id
+        select_statements.clear()
+        response = auth_client.post(f'/wishes/{wish_id}/reserve')
+        assert response.is_success
+        assert select_statements == []
+
 
 class TestMyUser:
     def test_get_user(self, user: User, auth_client: TestClient, db: Session):
@@ -824,6 +951,26 @@ class TestFollowUnfollow:
         assert event.action == FollowAction.follow
         assert event.source is None
 
+    def test_follow_user_does_not_load_follows(
+        self,
+        auth_client: TestClient,
+        db: Session,
+        user: User,
+        other_user: User,
+        third_user: User,
+        select_statements,
+    ):
+        # Ребро вставляется напрямую: коллекция подписок не подгружается,
+        # сколько бы их ни было.
+        user.follows.append(third_user)
+        db.commit()
+        db.refresh(user)
+        target_id = other_user.id
+        select_statements.clear()
+        response = auth_client.post(f'/follow/{target_id}')
+        assert response.status_code == 200
+        assert not any('user_following' in q for q in select_statements)
+
     def test_follow_user_with_source(
         self, auth_client: TestClient, db: Session, user: User, other_user: User
     ):
@@ -929,6 +1076,29 @@ class TestWishCRUD:
         response = auth_client.delete(f'/wishes/{uuid4()}')
         assert response.status_code == 404
 
+    def test_delete_other_user_wish(
+        self, auth_client: TestClient, db: Session, other_user_wish: Wish
+    ):
+        wish_id = other_user_wish.id
+        response = auth_client.delete(f'/wishes/{wish_id}')
+        assert response.status_code == 403
+        assert db.get(Wish, wish_id) is not None
+
+    def test_delete_wish_query_count(
+        self,
+        auth_client: TestClient,
+        db: Session,
+        user: User,
+        wish: Wish,
+        select_statements,
+    ):
+        wish_id = wish.id
+        db.refresh(user)
+        select_statements.clear()
+        response = auth_client.delete(f'/wishes/{wish_id}')
+        assert response.status_code == 200
+        assert select_statements == []
+
 
 @pytest.fixture
 def mocked_profile_media(tmp_path: Path, mocker) -> Path:
@@ -1022,6 +1192,21 @@ class TestUsersExtra:
         assert len(response.json()) == 1
         assert response.json()[0]['id'] == str(other_user.id)
 
+    def test_possible_friends_excludes_followed(
+        self,
+        auth_client: TestClient,
+        db: Session,
+        user: User,
+        other_user: User,
+        third_user: User,
+    ):
+        user.vk_friends_data = [{'id': other_user.vk_id}, {'id': third_user.vk_id}]
+        user.follows.append(third_user)
+        db.commit()
+        response = auth_client.get('/possible_friends')
+        assert response.status_code == 200
+        assert [u['id'] for u in response.json()] == [str(other_user.id)]
+
     def test_item_info_parse_error(self, auth_client: TestClient, mocker):
         from app.parsers import ItemInfoParseError
 
@@ -1,8 +1,10 @@
+import threading
 from datetime import date
 
 import pytest
 from fastapi import HTTPException
 from firebase_admin.exceptions import AlreadyExistsError, FirebaseError
+from sqlalchemy import select
 
 from app.constants import Gender
 from app.db import User
@@ -23,6 +25,7 @@ def test_auth_vk_already_exists(mocker, db):
             birthdate=date(1990, 1, 1),
         ),
     )
+    mocker.patch('app.routers.auth.get_vk_user_friends', return_value=[])
     mocker.patch(
         'app.routers.auth.create_firebase_user',
         side_effect=AlreadyExistsError('exists'),
@@ -103,6 +106,89 @@ def test_auth_vk_refreshes_friends_snapshot_on_login(mocker, db):
     assert existing.vk_friends_data == [{'id': 'fresh'}]
 
 
+def test_auth_vk_fetches_friends_concurrently(mocker, db):
+    # friends.get стартует, не дожидаясь users.get: фейковый users.get ждёт,
+    # пока параллельно не начнётся запрос друзей.
+    friends_started = threading.Event()
+
+    def _fake_get_friends(access_token):
+        friends_started.set()
+        return [{'id': 'fresh'}]
+
+    def _fake_get_basic_data(access_token):
+        assert friends_started.wait(timeout=5)
+        return VkUserBasicData(
+            id=44,
+            first_name='A',
+            last_name='B',
+            photo_url='',
+            gender=Gender.male,
+            birthdate=None,
+        )
+
+    existing = User(
+        display_name='Existing',
+        vk_id='44',
+        firebase_uid='fb_44',
+        registered_at=utc_now(),
+    )
+    db.add(existing)
+    db.commit()
+    mocker.patch(
+        'app.routers.auth.get_vk_user_data_by_access_token', _fake_get_basic_data
+    )
+    mocker.patch('app.routers.auth.get_vk_user_friends', _fake_get_friends)
+    mocker.patch('app.routers.auth.create_custom_firebase_token', return_value='tok')
+
+    auth_vk('token', VkUserExtraData(email=None, phone=None), db)
+    db.refresh(existing)
+    assert existing.vk_friends_data == [{'id': 'fresh'}]
+
+
+def test_auth_vk_concurrent_first_login(mocker, db):
+    # Параллельный первый вход успел создать юзера между нашим SELECT и INSERT:
+    # логин не падает на уникальности vk_id, а входит в уже созданный аккаунт.
+    def _concurrent_login_creates_user(**kwargs):
+        db.add(
+            User(
+                display_name='Concurrent',
+                vk_id='45',
+                firebase_uid='fb_concurrent',
+                registered_at=utc_now(),
+            )
+        )
+        db.commit()
+        return 'fb_ours'
+
+    mocker.patch(
+        'app.routers.auth.get_vk_user_data_by_access_token',
+        return_value=VkUserBasicData(
+            id=45,
+            first_name='A',
+            last_name='B',
+            photo_url='',
+            gender=Gender.male,
+            birthdate=None,
+        ),
+    )
+    mocker.patch('app.routers.auth.get_vk_user_friends', return_value=[])
+    mocker.patch(
+        'app.routers.auth.create_firebase_user',
+        side_effect=_concurrent_login_creates_user,
+    )
+    delete_firebase_user = mocker.patch('app.routers.auth.delete_firebase_user')
+    mocker.patch('app.routers.auth.create_custom_firebase_token', return_value='tok')
+
+    firebase_uid, _, is_new = auth_vk(
+        'token', VkUserExtraData(email=None, phone=None), db
+    )
+    assert (firebase_uid, is_new) == ('fb_concurrent', False)
+    delete_firebase_user.assert_called_once_with('fb_ours')
+    assert db.scalars(select(User).where(User.vk_id == '45')).one().firebase_uid == (
+        'fb_concurrent'
+    )
+
+
 def test_auth_firebase_invalid_token(mocker, db):
     mocker.patch(
         'app.routers.auth.verify_id_token', side_effect=FirebaseError(1, 'error')
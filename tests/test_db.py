@@ -1,9 +1,11 @@
 from uuid import UUID
 
 import pytest
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import inspect, select
+from sqlalchemy.exc import IntegrityError, InvalidRequestError
+from sqlalchemy.orm import Session
 
-from app.db import User, Wish
+from app.db import User, Wish, strict_loading
 from app.utils import utc_now
 
 
@@ -26,6 +28,46 @@ def test_push_token_empty_string_rejected(db):
         db.commit()
 
 
+def test_vk_friends_data_deferred(db):
+    # Снимок VK-друзей не грузится вместе со строкой юзера — только по обращению.
+    user = User(
+        display_name='Deferred',
+        firebase_uid='deferred_uid',
+        vk_friends_data=[{'id': 1}],
+        registered_at=utc_now(),
+    )
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.expunge_all()
+
+    loaded = db.execute(select(User).where(User.id == user_id)).scalar_one()
+    assert 'vk_friends_data' in inspect(loaded).unloaded
+    assert loaded.vk_friends_data == [{'id': 1}]
+
+
+def test_strict_loading_raises_on_lazy_load(db: Session, mocker):
+    # В debug незапланированная ленивая загрузка связи падает (ловим N+1).
+    mocker.patch('app.db.settings.IS_DEBUG', True)
+    owner = User(
+        display_name='Owner', firebase_uid='owner_uid', registered_at=utc_now()
+    )
+    db.add(owner)
+    db.flush()
+    db.add(Wish(user_id=owner.id, name='gift'))
+    db.commit()
+    db.expunge_all()
+
+    wish = db.execute(select(Wish).options(*strict_loading())).scalar_one()
+    with pytest.raises(InvalidRequestError):
+        _ = wish.user
+
+
+def test_strict_loading_disabled_in_prod(mocker):
+    mocker.patch('app.db.settings.IS_DEBUG', False)
+    assert strict_loading() == ()
+
+
 def test_wish_str():
     wish = Wish(name='Gift')
     assert 'Gift' in str(wish)
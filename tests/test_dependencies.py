@@ -1,10 +1,17 @@
+import time
 from uuid import uuid4
 
 import pytest
 from fastapi import HTTPException, Request
 
 from app.db import User, Wish
-from app.dependencies import get_current_user, get_current_user_wish, get_db
+from app.dependencies import (
+    _verified_tokens,
+    _verify_id_token_cached,
+    get_current_user,
+    get_current_user_wish,
+    get_db,
+)
 from app.utils import utc_now
 
 
@@ -195,3 +202,42 @@ def test_get_current_user_wish_success(db):
 
     result = get_current_user_wish(wish.id, user, db)
     assert result.id == wish.id
+
+
+def test_verify_id_token_cached_hit(mocker):
+    verify = mocker.patch(
+        'app.dependencies.verify_id_token',
+        return_value={'uid': 'uid1', 'exp': time.time() + 3600},
+    )
+    assert _verify_id_token_cached('token')['uid'] == 'uid1'
+    assert _verify_id_token_cached('token')['uid'] == 'uid1'
+    # Повторный запрос с тем же токеном не проверяет подпись заново
+    verify.assert_called_once_with('token')
+
+
+def test_verify_id_token_cached_not_beyond_token_exp(mocker):
+    # Токен, истекающий раньше TTL кэша, не переживает свой exp
+    verify = mocker.patch(
+        'app.dependencies.verify_id_token',
+        return_value={'uid': 'uid1', 'exp': time.time() - 1},
+    )
+    _verify_id_token_cached('token')
+    _verify_id_token_cached('token')
+    assert verify.call_count == 2
+
+
+def test_verify_id_token_cached_evicts_when_full(mocker):
+    mocker.patch('app.dependencies.VERIFIED_TOKEN_CACHE_SIZE', 2)
+    mocker.patch(
+        'app.dependencies.verify_id_token',
+        return_value={'uid': 'uid1', 'exp': time.time() + 3600},
+    )
+    _verified_tokens[b'stale'] = ({'uid': 'old'}, time.time() - 1)
+    _verified_tokens[b'fresh'] = ({'uid': 'new'}, time.time() + 30)
+    # Сначала вычищаются только протухшие записи
+    _verify_id_token_cached('token1')
+    assert b'stale' not in _verified_tokens
+    assert b'fresh' in _verified_tokens
+    # Живые записи не влезают — кэш сбрасывается целиком
+    _verify_id_token_cached('token2')
+    assert len(_verified_tokens) == 1
@@ -1,8 +1,12 @@
+import base64
+import json
 from datetime import datetime
 from unittest.mock import MagicMock
 from uuid import uuid4
 
+import firebase_admin
 from firebase_admin import messaging
+from firebase_admin.auth import CertificateFetchError, InvalidIdTokenError
 from sqlalchemy import select
 
 from app.db import User
@@ -13,6 +17,7 @@ from app.firebase import (
     delete_firebase_user,
     get_firebase_user_data,
     send_push,
+    warm_up_id_token_verifier,
 )
 
 
@@ -144,3 +149,43 @@ def test_get_firebase_user_data(mocker):
     mock_auth = mocker.patch('app.firebase.auth')
     get_firebase_user_data('uid')
     mock_auth.get_user.assert_called_once_with('uid')
+
+
+def _decode_segment(segment: str) -> dict:
+    return json.loads(base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4)))
+
+
+def test_warm_up_id_token_verifier_checks_project_token():
+    tokens = []
+
+    def verify(token):
+        tokens.append(token)
+        raise InvalidIdTokenError('bad signature')
+
+    warm_up_id_token_verifier(verify)
+
+    # Фиктивный токен должен дойти до загрузки ключей, а не отсеяться на клеймах
+    header, payload, signature = tokens[0].split('.')
+    project_id = firebase_admin.get_app().project_id
+    assert _decode_segment(header)['alg'] == 'RS256'
+    assert _decode_segment(payload)['aud'] == project_id
+    assert (
+        _decode_segment(payload)['iss']
+        == f'https://securetoken.google.com/{project_id}'
+    )
+    assert signature == ''
+
+
+def test_warm_up_id_token_verifier_fetch_error():
+    def verify(token):
+        raise CertificateFetchError('network down', cause=None)
+
+    warm_up_id_token_verifier(verify)
+
+
+def test_warm_up_id_token_verifier_unexpected_error():
+    def verify(token):
+        raise RuntimeError('boom')
+
+    # Любая другая ошибка тоже не вылетает из фонового потока прогрева
+    warm_up_id_token_verifier(verify)
@@ -1,7 +1,16 @@
 import pytest
 from fastapi.testclient import TestClient
 
-from app.main import app
+from app.main import app, warm_up_id_token_verifier
+
+
+def test_lifespan_warms_up(mocker):
+    thread = mocker.patch('app.main.threading.Thread')
+    mocker.patch.object(app, 'openapi_schema', None)
+    with TestClient(app):
+        assert app.openapi_schema is not None
+    thread.assert_called_once_with(target=warm_up_id_token_verifier, daemon=True)
+    thread.return_value.start.assert_called_once()
 
 
 def test_health(api_client: TestClient):
@@ -17,6 +26,15 @@ def test_health_ready_ok(db, api_client: TestClient):
     assert response.json() == {'status': 'ok'}
 
 
+def test_health_ready_runs_in_threadpool():
+    import inspect
+
+    from app.main import health_ready
+
+    # Блокирующие запросы к БД не должны исполняться в event loop.
+    assert not inspect.iscoroutinefunction(health_ready)
+
+
 def test_health_ready_db_down(api_client: TestClient):
     from sqlalchemy import create_engine
     from sqlalchemy.orm import sessionmaker
@@ -77,6 +95,28 @@ def test_custom_openapi():
     assert app.openapi() is openapi
 
 
+def test_openapi_json_served_from_cached_bytes(api_client: TestClient, mocker):
+    mocker.patch.dict('app.main._openapi_json_cache', clear=True)
+    openapi = mocker.spy(app, 'openapi')
+    first = api_client.get('/openapi.json')
+    second = api_client.get('/openapi.json')
+    assert first.status_code == 200
+    assert first.headers['content-type'] == 'application/json'
+    assert first.json()['security'] == [{'ApiKey': []}]
+    assert first.content == second.content
+    # Схема собирается и кодируется один раз, дальше отдаются готовые байты
+    openapi.assert_called_once()
+
+
+def test_openapi_json_adds_root_path_server(mocker):
+    mocker.patch.dict('app.main._openapi_json_cache', clear=True)
+    mocker.patch.object(app, 'root_path', '/api')
+    response = TestClient(app).get('/openapi.json')
+    assert response.json()['servers'][0] == {'url': '/api'}
+    # Общая закэшированная схема при этом не мутируется
+    assert 'servers' not in app.openapi()
+
+
 def test_internal_exception_handler_debug(mocker):
     # При IS_DEBUG=True ошибка в трекер не отправляется
     mocker.patch('app.main.settings.IS_DEBUG', True)
@@ -1,4 +1,6 @@
-from app.schemas import WishReadSchema
+from uuid import uuid4
+
+from app.schemas import CurrentUserReadSchema, WishReadSchema
 
 
 def test_wish_read_schema_empty_image():
@@ -6,3 +8,19 @@ def test_wish_read_schema_empty_image():
     assert WishReadSchema.make_image_url('') is None
     assert WishReadSchema.make_image_url(None) is None  # type: ignore
     assert WishReadSchema.make_image_url('img.jpg') == '/media/wish_images/img.jpg'
+
+
+def test_current_user_email_not_revalidated():
+    # Email из БД отдаётся как есть, без повторной проверки email-validator.
+    schema = CurrentUserReadSchema(
+        id=uuid4(),
+        display_name='User',
+        photo_url=None,
+        gender=None,
+        birth_date=None,
+        phone=None,
+        email='user@localhost',
+        follows=[],
+        followed_by=[],
+    )
+    assert schema.email == 'user@localhost'
@@ -26,7 +26,7 @@ def test_get_gender():
     assert get_gender(3) is None
 
 
-def test_get_vk_user_data_by_access_token(mocker):
+def test_get_vk_user_data_by_access_token(mock_vk_client):
     mock_response = MagicMock()
     mock_response.json.return_value = {
         'response': [
@@ -40,7 +40,7 @@ def test_get_vk_user_data_by_access_token(mocker):
             }
         ]
     }
-    mocker.patch('httpx.get', return_value=mock_response)
+    mock_vk_client.get.return_value = mock_response
 
     data = get_vk_user_data_by_access_token('token')
 
@@ -50,13 +50,13 @@ def test_get_vk_user_data_by_access_token(mocker):
     assert data.birthdate == date(2000, 1, 1)
 
 
-def test_get_vk_user_friends(mocker):
+def test_get_vk_user_friends(mock_vk_client):
     mock_response = MagicMock()
     mock_response.raise_for_status.return_value = None
     mock_response.json.return_value = {
         'response': {'items': [{'id': 1, 'first_name': 'Friend'}]}
     }
-    mocker.patch('httpx.get', return_value=mock_response)
+    mock_vk_client.get.return_value = mock_response
 
     friends = get_vk_user_friends('token')
     assert len(friends) == 1
@@ -126,13 +126,13 @@ def test_firebase_get_user_data(mocker):
     assert result.email == 'test@test.com'
 
 
-def test_get_extra_user_data_by_silent_token(mocker):
+def test_get_extra_user_data_by_silent_token(mock_vk_client):
     mock_response = MagicMock()
     mock_response.raise_for_status.return_value = None
     mock_response.json.return_value = {
         'response': {'success': [{'phone': '12345', 'email': 'test@test.com'}]}
     }
-    mocker.patch('httpx.post', return_value=mock_response)
+    mock_vk_client.post.return_value = mock_response
 
     data = get_extra_user_data_by_silent_token('silent_token', 'uuid')
     assert data.phone == '12345'
@@ -7,7 +7,9 @@ from sqlalchemy.orm import Session
 from app.config import settings
 from app.db import User
 from app.helpers.user_helpers import (
+    AVATAR_DOWNLOAD_TIMEOUT_SECONDS,
     download_avatar_bytes,
+    get_avatar_client,
     guess_image_extension,
     refresh_avatar_on_login,
     upscale_google_avatar_url,
@@ -100,15 +102,28 @@ def test_download_returns_none_on_error():
     assert download_avatar_bytes('https://cdn.test/x.jpg', _client(handler)) is None
 
 
-def test_download_creates_own_client_when_not_passed(mocker):
-    # Ветка client=None: подсовываем клиент на MockTransport через фабрику.
+def test_download_uses_shared_client_when_not_passed(mocker):
+    # Ветка client=None: подменяем общий клиент модуля на MockTransport.
     def handler(request: httpx.Request) -> httpx.Response:
         return httpx.Response(200, content=JPEG)
 
-    mocker.patch('app.helpers.user_helpers.httpx.Client', return_value=_client(handler))
+    mocker.patch(
+        'app.helpers.user_helpers.get_avatar_client', return_value=_client(handler)
+    )
     assert download_avatar_bytes('https://cdn.test/x.jpg') == JPEG
 
 
+def test_avatar_client_is_shared():
+    get_avatar_client.cache_clear()
+    client = get_avatar_client()
+    try:
+        assert get_avatar_client() is client
+        assert client.timeout.read == AVATAR_DOWNLOAD_TIMEOUT_SECONDS
+    finally:
+        get_avatar_client.cache_clear()
+        client.close()
+
+
 # --- refresh_avatar_on_login ---
 
 
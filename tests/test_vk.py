@@ -1,4 +1,8 @@
+import os
+import subprocess
+import sys
 from datetime import date
+from pathlib import Path
 
 import pytest
 from fastapi import HTTPException
@@ -6,14 +10,41 @@ from fastapi import HTTPException
 from app.config import settings
 from app.constants import VK_HIDDEN_BIRTH_YEAR, Gender
 from app.vk import (
+    VK_REQUEST_TIMEOUT_SECONDS,
     VkResponseError,
     exchange_vk_code,
     get_gender,
+    get_vk_client,
     get_vk_user_data_by_access_token,
     get_vk_user_friends,
 )
 
 
+def test_vk_client_is_shared():
+    get_vk_client.cache_clear()
+    client = get_vk_client()
+    try:
+        assert get_vk_client() is client
+        assert client.timeout.read == VK_REQUEST_TIMEOUT_SECONDS
+    finally:
+        get_vk_client.cache_clear()
+        client.close()
+
+
+def test_import_does_not_build_client_from_env_proxy():
+    # Клиенты не создаются при импорте: прокси из окружения, с которым httpx не
+    # может построить клиент (SOCKS без socksio), не роняет импорт модулей.
+    env = {**os.environ, 'ALL_PROXY': 'socks5://127.0.0.1:1'}
+    result = subprocess.run(
+        [sys.executable, '-c', 'import app.vk, app.helpers.user_helpers'],
+        cwd=Path(__file__).parent.parent,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
 def test_get_gender():
     assert get_gender(1) == Gender.female
     assert get_gender(2) == Gender.male
@@ -22,7 +53,7 @@ def test_get_gender():
     assert get_gender(3) is None
 
 
-def test_get_vk_user_data_by_access_token(mocker):
+def test_get_vk_user_data_by_access_token(mocker, mock_vk_client):
     mock_response = mocker.Mock()
     mock_response.json.return_value = {
         'response': [
@@ -36,7 +67,7 @@ def test_get_vk_user_data_by_access_token(mocker):
             }
         ]
     }
-    mocker.patch('httpx.get', return_value=mock_response)
+    mock_vk_client.get.return_value = mock_response
 
     data = get_vk_user_data_by_access_token('token')
     assert data.id == 123
@@ -44,8 +75,7 @@ def test_get_vk_user_data_by_access_token(mocker):
     assert data.birthdate == date(1990, 1, 1)
 
 
-def _vk_user_response(mocker, bdate: str | None):
-    mock_response = mocker.Mock()
+def _vk_user_response(mock_vk_client, bdate: str | None):
     payload = {
         'id': 123,
         'first_name': 'Ivan',
@@ -54,34 +84,33 @@ def _vk_user_response(mocker, bdate: str | None):
     }
     if bdate is not None:
         payload['bdate'] = bdate
-    mock_response.json.return_value = {'response': [payload]}
-    mocker.patch('httpx.get', return_value=mock_response)
+    mock_vk_client.get.return_value.json.return_value = {'response': [payload]}
 
 
-def test_get_vk_user_data_by_access_token_hidden_year(mocker):
+def test_get_vk_user_data_by_access_token_hidden_year(mock_vk_client):
     # Год скрыт (`DD.MM`): день+месяц сохраняем с плейсхолдер-годом, не теряем ДР.
-    _vk_user_response(mocker, '1.5')
+    _vk_user_response(mock_vk_client, '1.5')
     data = get_vk_user_data_by_access_token('token')
     assert data.gender is None
     assert data.birthdate == date(VK_HIDDEN_BIRTH_YEAR, 5, 1)
 
 
-def test_get_vk_user_data_by_access_token_hidden_year_leap_day(mocker):
+def test_get_vk_user_data_by_access_token_hidden_year_leap_day(mock_vk_client):
     # 29.02 при скрытом годе не теряется — плейсхолдер-год високосный.
-    _vk_user_response(mocker, '29.2')
+    _vk_user_response(mock_vk_client, '29.2')
     data = get_vk_user_data_by_access_token('token')
     assert data.birthdate == date(VK_HIDDEN_BIRTH_YEAR, 2, 29)
 
 
 @pytest.mark.parametrize('bdate', [None, '', 'garbage', '31.2', '1.5.bad'])
-def test_get_vk_user_data_by_access_token_unparseable_bdate(mocker, bdate):
+def test_get_vk_user_data_by_access_token_unparseable_bdate(mock_vk_client, bdate):
     # Пустое/битое/несуществующая дата → birthdate None, регистрация не падает.
-    _vk_user_response(mocker, bdate)
+    _vk_user_response(mock_vk_client, bdate)
     data = get_vk_user_data_by_access_token('token')
     assert data.birthdate is None
 
 
-def test_get_vk_user_data_by_access_token_unspecified_sex(mocker):
+def test_get_vk_user_data_by_access_token_unspecified_sex(mocker, mock_vk_client):
     # sex=0 (не указан) → gender None, регистрация не падает.
     mock_response = mocker.Mock()
     mock_response.json.return_value = {
@@ -95,73 +124,73 @@ def test_get_vk_user_data_by_access_token_unspecified_sex(mocker):
             }
         ]
     }
-    mocker.patch('httpx.get', return_value=mock_response)
+    mock_vk_client.get.return_value = mock_response
 
     data = get_vk_user_data_by_access_token('token')
     assert data.gender is None
     assert data.birthdate is None
 
 
-def test_get_vk_user_data_by_access_token_error(mocker):
+def test_get_vk_user_data_by_access_token_error(mocker, mock_vk_client):
     mock_response = mocker.Mock()
     mock_response.json.return_value = {'error': 'invalid token'}
-    mocker.patch('httpx.get', return_value=mock_response)
+    mock_vk_client.get.return_value = mock_response
 
     with pytest.raises(HTTPException) as exc:
         get_vk_user_data_by_access_token('token')
     assert exc.value.status_code == 401
 
 
-def test_get_vk_user_data_by_access_token_malformed(mocker):
+def test_get_vk_user_data_by_access_token_malformed(mocker, mock_vk_client):
     # Битая структура без явной ошибки VK → сбой интеграции (5xx → Hawk), не 401.
     mock_response = mocker.Mock()
     mock_response.json.return_value = {'response': [{'id': 123}]}
-    mocker.patch('httpx.get', return_value=mock_response)
+    mock_vk_client.get.return_value = mock_response
 
     with pytest.raises(VkResponseError):
         get_vk_user_data_by_access_token('token')
 
 
-def test_get_vk_user_data_by_access_token_empty(mocker):
+def test_get_vk_user_data_by_access_token_empty(mocker, mock_vk_client):
     mock_response = mocker.Mock()
     mock_response.json.return_value = {'response': []}
-    mocker.patch('httpx.get', return_value=mock_response)
+    mock_vk_client.get.return_value = mock_response
 
     with pytest.raises(VkResponseError):
         get_vk_user_data_by_access_token('token')
 
 
-def test_get_vk_user_friends(mocker):
+def test_get_vk_user_friends(mocker, mock_vk_client):
     mock_response = mocker.Mock()
     mock_response.json.return_value = {'response': {'items': [{'id': 1}, {'id': 2}]}}
-    mocker.patch('httpx.get', return_value=mock_response)
+    mock_vk_client.get.return_value = mock_response
 
     friends = get_vk_user_friends('token')
     assert len(friends) == 2
     assert friends[0]['id'] == 1
 
 
-def test_get_vk_user_friends_error(mocker):
+def test_get_vk_user_friends_error(mocker, mock_vk_client):
     # VK явно вернул ошибку (протухший токен) → 401.
     mock_response = mocker.Mock()
     mock_response.json.return_value = {'error': 'token expired'}
-    mocker.patch('httpx.get', return_value=mock_response)
+    mock_vk_client.get.return_value = mock_response
 
     with pytest.raises(HTTPException) as exc:
         get_vk_user_friends('token')
     assert exc.value.status_code == 401
 
 
-def test_get_vk_user_friends_malformed(mocker):
+def test_get_vk_user_friends_malformed(mocker, mock_vk_client):
     mock_response = mocker.Mock()
     mock_response.json.return_value = {'response': {'items': [{'no_id': 1}]}}
-    mocker.patch('httpx.get', return_value=mock_response)
+    mock_vk_client.get.return_value = mock_response
 
     with pytest.raises(VkResponseError):
         get_vk_user_friends('token')
 
 
-def test_exchange_vk_code_success(mocker):
+def test_exchange_vk_code_success(mocker, mock_vk_client):
     # VK ID (OAuth 2.1) отдаёт плоский ответ; email/phone — подтверждённые VK.
     mock_response = mocker.Mock()
     mock_response.json.return_value = {
@@ -171,7 +200,8 @@ def test_exchange_vk_code_success(mocker):
         'phone': '+70000000000',
         'user_id': 123,
     }
-    mock_post = mocker.patch('httpx.post', return_value=mock_response)
+    mock_post = mock_vk_client.post
+    mock_post.return_value = mock_response
 
     token, extra = exchange_vk_code('code', 'verifier', 'device', 'https://app/redir')
     assert token == 'vk2.a.new_token'
@@ -181,67 +211,69 @@ def test_exchange_vk_code_success(mocker):
     assert mock_post.call_args.kwargs['data']['redirect_uri'] == 'https://app/redir'
 
 
-def test_exchange_vk_code_web_redirect_uses_web_app(mocker):
+def test_exchange_vk_code_web_redirect_uses_web_app(mocker, mock_vk_client):
     # Веб One Tap ходит с https-origin → обмен под веб-app (VK_WEB_APP_ID).
     mock_response = mocker.Mock()
     mock_response.json.return_value = {'access_token': 'vk2.a.t', 'user_id': 1}
-    mock_post = mocker.patch('httpx.post', return_value=mock_response)
+    mock_post = mock_vk_client.post
+    mock_post.return_value = mock_response
 
     exchange_vk_code('code', 'verifier', 'device', 'https://hotelki.pro/')
 
     assert mock_post.call_args.kwargs['data']['client_id'] == settings.VK_WEB_APP_ID
 
 
-def test_exchange_vk_code_native_redirect_uses_mobile_app(mocker):
+def test_exchange_vk_code_native_redirect_uses_mobile_app(mocker, mock_vk_client):
     # Нативный SDK ходит с кастомной vk-схемой → обмен под мобильный app (VK_APP_ID).
     mock_response = mocker.Mock()
     mock_response.json.return_value = {'access_token': 'vk2.a.t', 'user_id': 1}
-    mock_post = mocker.patch('httpx.post', return_value=mock_response)
+    mock_post = mock_vk_client.post
+    mock_post.return_value = mock_response
 
     exchange_vk_code('code', 'verifier', 'device', 'vk51800170://vk.com/service.html')
 
     assert mock_post.call_args.kwargs['data']['client_id'] == settings.VK_APP_ID
 
 
-def test_exchange_vk_code_error(mocker):
+def test_exchange_vk_code_error(mocker, mock_vk_client):
     # VK ID отклонил обмен (код истёк/использован/невалиден) → 401, не 5xx.
     mock_response = mocker.Mock()
     mock_response.json.return_value = {
         'error': 'invalid_grant',
         'error_description': 'code is expired',
     }
-    mocker.patch('httpx.post', return_value=mock_response)
+    mock_vk_client.post.return_value = mock_response
 
     with pytest.raises(HTTPException) as exc:
         exchange_vk_code('code', 'verifier', 'device', 'https://app/redir')
     assert exc.value.status_code == 401
 
 
-def test_exchange_vk_code_malformed(mocker):
+def test_exchange_vk_code_malformed(mocker, mock_vk_client):
     # Нет ни error, ни access_token — неожиданный ответ → сбой интеграции (5xx → Hawk).
     mock_response = mocker.Mock()
     mock_response.json.return_value = {'unexpected': True}
-    mocker.patch('httpx.post', return_value=mock_response)
+    mock_vk_client.post.return_value = mock_response
 
     with pytest.raises(VkResponseError):
         exchange_vk_code('code', 'verifier', 'device', 'https://app/redir')
 
 
-def test_get_extra_user_data_by_silent_token_success(mocker):
+def test_get_extra_user_data_by_silent_token_success(mocker, mock_vk_client):
     from app.vk import get_extra_user_data_by_silent_token
 
     mock_response = mocker.Mock()
     mock_response.json.return_value = {
         'response': {'success': [{'email': 'test@test.com', 'phone': '+70000000000'}]}
     }
-    mocker.patch('httpx.post', return_value=mock_response)
+    mock_vk_client.post.return_value = mock_response
 
     data = get_extra_user_data_by_silent_token('silent', 'uuid')
     assert data.email == 'test@test.com'
     assert data.phone == '+70000000000'
 
 
-def test_get_extra_user_data_by_silent_token_error(mocker):
+def test_get_extra_user_data_by_silent_token_error(mocker, mock_vk_client):
     # VK явно вернул ошибку авторизации (протухший silent-токен) → 401.
     from app.vk import get_extra_user_data_by_silent_token
 
@@ -249,31 +281,31 @@ def test_get_extra_user_data_by_silent_token_error(mocker):
     mock_response.json.return_value = {
         'response': {'errors': [{'code': 1, 'description': 'invalid token'}]}
     }
-    mocker.patch('httpx.post', return_value=mock_response)
+    mock_vk_client.post.return_value = mock_response
 
     with pytest.raises(HTTPException) as exc:
         get_extra_user_data_by_silent_token('silent', 'uuid')
     assert exc.value.status_code == 401
 
 
-def test_get_extra_user_data_by_silent_token_no_success(mocker):
+def test_get_extra_user_data_by_silent_token_no_success(mocker, mock_vk_client):
     # Структура валидна, но профиля нет → сбой интеграции (5xx → Hawk), не 401.
     from app.vk import get_extra_user_data_by_silent_token
 
     mock_response = mocker.Mock()
     mock_response.json.return_value = {'response': {}}
-    mocker.patch('httpx.post', return_value=mock_response)
+    mock_vk_client.post.return_value = mock_response
 
     with pytest.raises(VkResponseError):
         get_extra_user_data_by_silent_token('silent', 'uuid')
 
 
-def test_get_extra_user_data_by_silent_token_malformed(mocker):
+def test_get_extra_user_data_by_silent_token_malformed(mocker, mock_vk_client):
     from app.vk import get_extra_user_data_by_silent_token
 
     mock_response = mocker.Mock()
     mock_response.json.return_value = {'no_response': True}
-    mocker.patch('httpx.post', return_value=mock_response)
+    mock_vk_client.post.return_value = mock_response
 
     with pytest.raises(VkResponseError):
         get_extra_user_data_by_silent_token('silent', 'uuid')